@@ -0,0 +1,13 @@
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# Backends whose data is not seen by other worker processes
+LOCAL_CACHE_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_shared_cache(alias=DEFAULT_CACHE_ALIAS):
+    """
+    Whether the cache is shared between processes, e.g. Redis or memcached.
+    """
+    return not isinstance(caches[alias], LOCAL_CACHE_BACKENDS)
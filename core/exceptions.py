@@ -0,0 +1,16 @@
+from django.db import OperationalError
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# PostgreSQL error code for statements cancelled by statement_timeout
+QUERY_CANCELED = '57014'
+
+
+def is_query_canceled(exc):
+    return isinstance(exc, OperationalError) and getattr(exc.__cause__, 'pgcode', None) == QUERY_CANCELED
+
+
+class QueryTimeout(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Request exceeded its database time budget, try again later.'
+    default_code = 'query_timeout'
@@ -0,0 +1,35 @@
+from django.core.cache import cache
+
+KEY_PREFIX = 'metrics'
+
+
+def increment(name, label='', value=1):
+    """
+    Add `value` to the counter `name` (optionally split by `label`) in the
+    shared cache, so counters are aggregated over all workers.
+    """
+    key = f'{KEY_PREFIX}:{name}:count:{label}'
+    if cache.add(key, value, None):
+        # Only the worker that created the counter registers its label, in a
+        # slot taken with an atomic increment so no registration is lost
+        slot = _increment(f'{KEY_PREFIX}:{name}:labels')
+        cache.set(f'{KEY_PREFIX}:{name}:label:{slot}', label, None)
+    else:
+        _increment(key, value)
+
+
+def _increment(key, value=1):
+    cache.add(key, 0, None)
+    try:
+        return cache.incr(key, value)
+    except ValueError:
+        # The key was evicted between add() and incr()
+        cache.set(key, value, None)
+        return value
+
+
+def get_counters(name):
+    slots = cache.get(f'{KEY_PREFIX}:{name}:labels', 0)
+    labels = cache.get_many([f'{KEY_PREFIX}:{name}:label:{slot}' for slot in range(1, slots + 1)])
+    keys = {f'{KEY_PREFIX}:{name}:count:{label}': label for label in labels.values()}
+    return {keys[key]: value for key, value in cache.get_many(keys).items()}
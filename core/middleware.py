@@ -0,0 +1,201 @@
+import functools
+import math
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.messages import middleware as messages_middleware
+from django.contrib.sessions import middleware as sessions_middleware
+from django.core.cache import cache
+from django.db import connection
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from core.compression import choose_encoding, compress, compress_async_sequence, compress_sequence
+from core.exceptions import is_query_canceled
+
+
+def is_lean_api_request(request):
+    """
+    Requests to the stateless API routes listed in LEAN_API['PATH_PREFIXES'].
+    """
+    prefixes = getattr(settings, 'LEAN_API', {}).get('PATH_PREFIXES', ())
+    if request is None or not prefixes:
+        return False
+    return request.path_info.startswith(tuple(prefixes))
+
+
+class SessionMiddleware(sessions_middleware.SessionMiddleware):
+    def process_request(self, request):
+        if not is_lean_api_request(request):
+            super().process_request(request)
+
+    def process_response(self, request, response):
+        if is_lean_api_request(request):
+            return response
+        return super().process_response(request, response)
+
+
+class AuthenticationMiddleware(auth_middleware.AuthenticationMiddleware):
+    def process_request(self, request):
+        if not is_lean_api_request(request):
+            super().process_request(request)
+
+
+class MessageMiddleware(messages_middleware.MessageMiddleware):
+    def process_request(self, request):
+        if not is_lean_api_request(request):
+            super().process_request(request)
+
+    def process_response(self, request, response):
+        if is_lean_api_request(request):
+            return response
+        return super().process_response(request, response)
+
+
+class LoadSheddingMiddleware:
+    """
+    Track database query latency and connection usage and answer the
+    expensive list endpoints with 503 while either is over its threshold.
+
+    Query latency is the QUERY_LATENCY_PERCENTILE of the queries the shed
+    routes ran in this process during the last RETRY_AFTER seconds, so that
+    shedding stops by itself. It needs QUERY_LATENCY_MIN_SAMPLES queries,
+    a single slow query is not overload. Queries cancelled by their
+    statement_timeout are left out, the route has already answered 503.
+    Connection usage is sampled from pg_stat_activity at most every
+    CHECK_INTERVAL seconds and shared between workers through the cache.
+    """
+    CONNECTION_USAGE_KEY = 'load-shedding:connection-usage'
+    CONNECTION_USAGE_LOCK_KEY = 'load-shedding:connection-usage-lock'
+    MAX_SAMPLES = 10000
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # (finished at, duration) of recent queries, oldest first
+        self.samples = deque(maxlen=self.MAX_SAMPLES)
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        with connection.execute_wrapper(functools.partial(self.record_query, request)):
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        options = settings.LOAD_SHEDDING
+        if request.method != 'GET' or request.resolver_match.url_name not in options['URL_NAMES']:
+            return None
+        if not self.is_overloaded(options):
+            return None
+        response = JsonResponse(
+            {'detail': 'Service is overloaded, try again later.'},
+            status=503,
+        )
+        response['Retry-After'] = str(options['RETRY_AFTER'])
+        return response
+
+    def record_query(self, request, execute, sql, params, many, context):
+        # Only queries of the shed routes, e.g. not the admin without statement timeouts
+        url_name = getattr(request.resolver_match, 'url_name', None)
+        if url_name not in settings.LOAD_SHEDDING['URL_NAMES']:
+            return execute(sql, params, many, context)
+        start = time.monotonic()
+        try:
+            result = execute(sql, params, many, context)
+        except Exception as exc:
+            if not is_query_canceled(exc):
+                self.add_sample(start, time.monotonic())
+            raise
+        self.add_sample(start, time.monotonic())
+        return result
+
+    def add_sample(self, start, end):
+        with self.lock:
+            self.samples.append((end, end - start))
+
+    def get_latency(self, options):
+        """
+        The QUERY_LATENCY_PERCENTILE of recent query durations, None
+        without enough samples.
+        """
+        expired = time.monotonic() - options['RETRY_AFTER']
+        with self.lock:
+            while self.samples and self.samples[0][0] < expired:
+                self.samples.popleft()
+            durations = sorted(duration for _, duration in self.samples)
+        if not durations or len(durations) < options['QUERY_LATENCY_MIN_SAMPLES']:
+            return None
+        index = math.ceil(len(durations) * options['QUERY_LATENCY_PERCENTILE'] / 100) - 1
+        return durations[max(index, 0)]
+
+    def is_overloaded(self, options):
+        latency = self.get_latency(options)
+        if latency is not None and latency > options['QUERY_LATENCY_THRESHOLD']:
+            return True
+        return self.get_connection_usage(options) > options['CONNECTION_USAGE_THRESHOLD']
+
+    def get_connection_usage(self, options):
+        usage = cache.get(self.CONNECTION_USAGE_KEY)
+        if usage is not None or connection.vendor != 'postgresql':
+            return usage or 0.0
+        if not cache.add(self.CONNECTION_USAGE_LOCK_KEY, True, options['CHECK_INTERVAL']):
+            return 0.0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*)::float / current_setting('max_connections')::int "
+                "FROM pg_stat_activity WHERE datname = current_database()"
+            )
+            usage = cursor.fetchone()[0]
+        cache.set(self.CONNECTION_USAGE_KEY, usage, options['CHECK_INTERVAL'])
+        return usage
+
+
+class CompressionMiddleware:
+    """
+    Compress JSON responses with the best encoding the client accepts out of
+    COMPRESSION['ENCODINGS']. Streaming responses are compressed chunk by chunk.
+    Only COMPRESSION['CONTENT_TYPES'] are compressed, which keeps pages with
+    CSRF tokens out of reach of BREACH-style attacks.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        options = settings.COMPRESSION
+
+        if response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').partition(';')[0].strip()
+        if content_type not in options['CONTENT_TYPES']:
+            return response
+        if not response.streaming and len(response.content) < options['MIN_LENGTH']:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), options['ENCODINGS'])
+        if encoding is None:
+            return response
+        level = options['LEVELS'][encoding]
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_sequence(response.streaming_content, encoding, level)
+            else:
+                response.streaming_content = compress_sequence(response.streaming_content, encoding, level)
+            del response.headers['Content-Length']
+        else:
+            compressed_content = compress(response.content, encoding, level)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(compressed_content))
+
+        # A compressed body is not byte-identical, so a strong ETag becomes weak
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
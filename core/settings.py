@@ -33,17 +33,21 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'drf_spectacular',
     'rest_framework',
+    'rest_framework.authtoken',
     'management',
     'users',
+    'jobs',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.LoadSheddingMiddleware',
+    'core.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.AuthenticationMiddleware',
+    'core.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -85,6 +89,19 @@ DATABASES = {
     )
 }
 
+# Shared cache for throttling, sessions and auth tokens; per-process memory if unset
+REDIS_URL = os.environ.get('REDIS_URL', '').strip()
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+    # Cached sessions need a shared cache, a per-process one would keep
+    # logged out sessions alive in other workers
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -130,8 +147,8 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'users.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
     ],
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
@@ -145,8 +162,88 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.CostRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'api': '1200/min',
+    },
+}
+
+# Every ROWS_PER_UNIT rows requested through PAGE_PARAMS cost one more request
+THROTTLE_COST = {
+    'PAGE_PARAMS': ['limit', 'product_limit'],
+    'ROWS_PER_UNIT': 50,
+}
+
+# Response compression, see `python manage.py bench_compression` for levels
+COMPRESSION = {
+    'ENCODINGS': ['zstd', 'br', 'gzip'],
+    'LEVELS': {'zstd': 3, 'br': 4, 'gzip': 5},
+    'MIN_LENGTH': 1024,
+    'CONTENT_TYPES': [
+        'application/json',
+        'application/vnd.oai.openapi',
+        'application/vnd.oai.openapi+json',
+        'application/yaml',
+    ],
+}
+
+# 503 for list endpoints while the database is overloaded, query latency is
+# the percentile of the queries these routes ran during the last RETRY_AFTER seconds
+LOAD_SHEDDING = {
+    'URL_NAMES': ['product-list', 'company-list'],
+    'QUERY_LATENCY_THRESHOLD': 0.5,
+    'QUERY_LATENCY_PERCENTILE': 90,
+    'QUERY_LATENCY_MIN_SAMPLES': 20,
+    'CONNECTION_USAGE_THRESHOLD': 0.9,
+    'CHECK_INTERVAL': 5,
+    'RETRY_AFTER': 10,
+}
+
+# Stateless API routes: no sessions/messages, JSON only, token auth only
+LEAN_API = {
+    'PATH_PREFIXES': ['/companies/', '/products/', '/jobs/'],
+    'RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    'AUTHENTICATION_CLASSES': ['users.authentication.CachedTokenAuthentication'],
+}
+
+# PostgreSQL statement_timeout (ms) per route name of the API views, 0 disables it
+STATEMENT_TIMEOUTS = {
+    'DEFAULT': 5000,
+    'ROUTES': {
+        'product-list': 2000,
+        'company-list': 3000,
+        'company': 3000,
+    },
+}
+
+# Per-process company snapshots, checked against the shared version every interval (s).
+# Disabled without a shared cache (REDIS_URL), other workers would not see invalidations.
+COMPANY_CACHE = {
+    'MAX_SIZE': 10000,
+    'VERSION_CHECK_INTERVAL': 1,
 }
 
+# Default number of hash partitions for `python manage.py partition_products` (PostgreSQL).
+# Whether products require a company follows the actual table layout.
+PRODUCT_PARTITIONS = int(os.environ.get('PRODUCT_PARTITIONS', 0))
+
+# Background jobs, see `python manage.py run_workers`. A running job is
+# requeued when its worker does not report progress for LEASE seconds.
+JOBS = {
+    'WORKERS': 2,
+    'POLL_INTERVAL': 1,
+    'RETRY_DELAY': 10,
+    'LEASE': 300,
+}
+
+# Resolved API tokens: shared cache ttl (only with a shared cache, e.g. REDIS_URL) and
+# per-process LRU (ttl bounds revocation delay)
+AUTH_TOKEN_CACHE_TTL = 300
+AUTH_TOKEN_LOCAL_CACHE_SIZE = 1024
+AUTH_TOKEN_LOCAL_CACHE_TTL = 5
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Reviro Test API',
     'DESCRIPTION': 'Reviro Test Task API',
@@ -155,4 +252,7 @@ SPECTACULAR_SETTINGS = {
     # OTHER SETTINGS
 }
 
+# Prebuilt schema, see `python manage.py spectacular --file schema.yml`
+OPENAPI_SCHEMA_FILE = BASE_DIR / 'schema.yml'
+
 AUTH_USER_MODEL = "users.CustomUser"
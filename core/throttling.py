@@ -0,0 +1,77 @@
+from django.conf import settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from management.paginators import CustomPaginator
+
+
+class CostRateThrottle(SimpleRateThrottle):
+    """
+    Per-client rate limit where every request is charged by the number of
+    rows it asks for through the pagination query parameters.
+
+    Usage is counted with atomic cache increments in fixed windows and the
+    previous window is weighted by the time left, so the budget refills
+    continuously like a token bucket without read-modify-write races.
+    """
+    scope = 'api'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def get_cost(self, request):
+        cost = 1
+        for param in settings.THROTTLE_COST['PAGE_PARAMS']:
+            try:
+                limit = int(request.query_params[param])
+            except (KeyError, ValueError):
+                continue
+            # Pages never hold more than max_limit rows
+            limit = min(max(limit, 0), CustomPaginator.max_limit)
+            cost += limit // settings.THROTTLE_COST['ROWS_PER_UNIT']
+        # A request costing more than the whole budget could never be allowed
+        return min(cost, self.num_requests)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        cost = self.get_cost(request)
+        self.now = self.timer()
+        window, elapsed = divmod(self.now, self.duration)
+        current_key = f'{self.key}:{int(window)}'
+
+        previous = self.cache.get(f'{self.key}:{int(window) - 1}', 0)
+        current = self.increment(current_key, cost)
+        weight = 1 - elapsed / self.duration
+        used = previous * weight + current
+        if used <= self.num_requests:
+            return True
+
+        # Rejected requests do not consume the budget
+        self.cache.decr(current_key, cost)
+        excess = used - self.num_requests
+        if previous and previous * weight >= excess:
+            self.wait_seconds = excess * self.duration / previous
+        else:
+            self.wait_seconds = self.duration - elapsed
+        return False
+
+    def increment(self, key, cost):
+        self.cache.add(key, 0, self.duration * 2)
+        try:
+            return self.cache.incr(key, cost)
+        except ValueError:
+            # The key expired between add() and incr()
+            self.cache.set(key, cost, self.duration * 2)
+            return cost
+
+    def wait(self):
+        return self.wait_seconds
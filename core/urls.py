@@ -1,10 +1,16 @@
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularSwaggerView
+from rest_framework.authtoken.views import obtain_auth_token
+
+from core.views import CachedSpectacularAPIView, MetricsView
 
 urlpatterns = [
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('api/schema/', CachedSpectacularAPIView.as_view(), name='schema'),
     path('', SpectacularSwaggerView.as_view(url_name='schema'), name='docs'),
+    path('api/token/', obtain_auth_token, name='token'),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
     path('admin/', admin.site.urls),
     path('', include('management.urls')),
+    path('', include('jobs.urls')),
 ]
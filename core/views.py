@@ -0,0 +1,168 @@
+import hashlib
+import importlib
+import logging
+import threading
+from pathlib import Path
+
+import yaml
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.module_loading import import_string
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core import metrics
+from core.exceptions import QueryTimeout, is_query_canceled
+from core.middleware import is_lean_api_request
+from management.caches import company_cache
+
+logger = logging.getLogger(__name__)
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    OpenAPI schema generated once per process instead of on every request.
+
+    The schema is loaded from OPENAPI_SCHEMA_FILE when it was prebuilt with
+    `manage.py spectacular --file` after the last change of the project code,
+    otherwise it is generated on first access.
+    Rendered bodies are kept per format and served with an ETag.
+    """
+    _schemas = {}
+    _rendered = {}
+    _lock = threading.Lock()
+
+    def _get_schema_response(self, request):
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        renderer = request.accepted_renderer
+        key = (version, translation.get_language(), renderer.media_type)
+
+        rendered = self._rendered.get(key)
+        if rendered is None:
+            with self._lock:
+                rendered = self._rendered.get(key)
+                if rendered is None:
+                    content = renderer.render(self._get_schema(version), request.accepted_media_type)
+                    etag = '"%s"' % hashlib.md5(content).hexdigest()
+                    rendered = self._rendered[key] = (content, etag)
+        content, etag = rendered
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = HttpResponse(content, content_type=content_type)
+        response['ETag'] = etag
+        response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, version)}"'
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+    def _get_schema(self, version):
+        key = (version, translation.get_language())
+        if key not in self._schemas:
+            schema_file = getattr(settings, 'OPENAPI_SCHEMA_FILE', None)
+            if version is None and schema_file and is_schema_file_fresh(schema_file):
+                with open(schema_file) as file:
+                    self._schemas[key] = yaml.safe_load(file)
+            else:
+                generator = self.generator_class(urlconf=self.urlconf, api_version=version, patterns=self.patterns)
+                self._schemas[key] = generator.get_schema(request=None, public=self.serve_public)
+        return self._schemas[key]
+
+
+def get_source_files():
+    """
+    Python files of the project apps and of the settings/urlconf package.
+    """
+    directories = {Path(importlib.import_module(settings.ROOT_URLCONF).__file__).parent}
+    directories.update(
+        Path(app_config.path) for app_config in apps.get_app_configs()
+        if Path(app_config.path).is_relative_to(settings.BASE_DIR)
+    )
+    for directory in directories:
+        yield from directory.rglob('*.py')
+
+
+def is_schema_file_fresh(schema_file):
+    """
+    Whether the prebuilt schema exists and is newer than every source file.
+    """
+    try:
+        built = schema_file.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    stale = next((path for path in get_source_files() if path.stat().st_mtime > built), None)
+    if stale is not None:
+        logger.warning("Ignoring %s, %s changed after it was built", schema_file, stale)
+        return False
+    return True
+
+
+def get_statement_timeout(route_name):
+    timeouts = settings.STATEMENT_TIMEOUTS
+    return timeouts['ROUTES'].get(route_name, timeouts['DEFAULT'])
+
+
+class LeanAPIView(APIView):
+    """
+    APIView that uses the LEAN_API renderers and authenticators on the
+    stateless API routes, where sessions and messages are not loaded.
+
+    On PostgreSQL every request runs in a transaction limited by the
+    STATEMENT_TIMEOUTS budget of its route, a cancelled query becomes 503.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        timeout = get_statement_timeout(request.resolver_match.url_name)
+        if not timeout or connection.vendor != 'postgresql':
+            return super().dispatch(request, *args, **kwargs)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL statement_timeout = %s', [timeout])
+            response = super().dispatch(request, *args, **kwargs)
+            # Handled errors, e.g. a cancelled query, must not commit the aborted transaction
+            if getattr(response, 'exception', False):
+                transaction.set_rollback(True)
+            return response
+
+    def handle_exception(self, exc):
+        if is_query_canceled(exc):
+            route_name = self.request.resolver_match.url_name
+            logger.warning("Query timeout on %s %s", route_name, self.request.get_full_path())
+            metrics.increment('query_timeouts', route_name)
+            exc = QueryTimeout()
+        return super().handle_exception(exc)
+
+    def get_renderers(self):
+        if is_lean_api_request(self.request):
+            return [import_string(renderer)() for renderer in settings.LEAN_API['RENDERER_CLASSES']]
+        return super().get_renderers()
+
+    def get_authenticators(self):
+        if is_lean_api_request(self.request):
+            return [import_string(auth)() for auth in settings.LEAN_API['AUTHENTICATION_CLASSES']]
+        return super().get_authenticators()
+
+
+class MetricsView(APIView):
+    """
+    Counters collected by all workers and the cache stats of this worker.
+    """
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(exclude=True)
+    def get(self, request):
+        return Response({
+            'query_timeouts': metrics.get_counters('query_timeouts'),
+            'company_cache': company_cache.stats(),
+        })
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from jobs.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'status', 'progress', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status', 'task')
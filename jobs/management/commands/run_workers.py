@@ -0,0 +1,67 @@
+import multiprocessing
+import signal
+import threading
+import time
+from multiprocessing.connection import wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.worker import run_worker
+
+
+def _worker_process():
+    # The parent process handles Ctrl+C and forwards SIGTERM, which lets
+    # the worker finish its current job. A per-process event is used because
+    # a shared one can not be set any more once a worker was killed waiting on it.
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    run_worker(stop_event)
+
+
+def _interrupt(signum, frame):
+    # Let the workers finish their current job on repeated signals
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    raise KeyboardInterrupt
+
+
+class Command(BaseCommand):
+    help = "Run background job worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.JOBS['WORKERS'])
+
+    def handle(self, *args, **options):
+        context = multiprocessing.get_context('fork')
+
+        def start_process():
+            # Forked workers must open their own database connections
+            connections.close_all()
+            process = context.Process(target=_worker_process, daemon=True)
+            process.start()
+            return process
+
+        processes = [start_process() for _ in range(options['workers'])]
+        self.stdout.write(f"Started {len(processes)} job workers")
+
+        signal.signal(signal.SIGINT, _interrupt)
+        signal.signal(signal.SIGTERM, _interrupt)
+        try:
+            while True:
+                wait([process.sentinel for process in processes])
+                # Do not restart a crashing worker in a busy loop
+                time.sleep(settings.JOBS['POLL_INTERVAL'])
+                for index, process in enumerate(processes):
+                    if not process.is_alive():
+                        self.stderr.write(f"Job worker {process.pid} exited with code {process.exitcode}, restarting")
+                        processes[index] = start_process()
+        except KeyboardInterrupt:
+            pass
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+        self.stdout.write("Job workers stopped")
@@ -0,0 +1,90 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, models
+from django.utils import timezone
+
+# A thread has its own database connection, so progress written through it
+# is visible to pollers while the task's transaction is still open
+_progress_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='job-progress')
+
+
+def get_lease_expiry():
+    return timezone.now() + timedelta(seconds=settings.JOBS['LEASE'])
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    task = models.CharField(max_length=100, verbose_name="Task")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Payload")
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=PENDING, verbose_name="Status"
+    )
+    progress = models.PositiveSmallIntegerField(default=0, verbose_name="Progress, %")
+    result = models.JSONField(null=True, blank=True, verbose_name="Result")
+    error = models.TextField(blank=True, verbose_name="Error")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Attempts")
+    max_attempts = models.PositiveSmallIntegerField(default=3, verbose_name="Max attempts")
+    run_after = models.DateTimeField(default=timezone.now, verbose_name="Run after")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created at")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Started at")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Finished at")
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name="Locked until")
+
+    class Meta:
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f"JOB: {self.pk} - task: {self.task} - status: {self.status}"
+
+    def get_file_path(self):
+        """
+        Where the job stores the file it produces, it is downloaded from
+        GET /jobs/<id>/file/.
+        """
+        return os.path.join(settings.MEDIA_ROOT, 'jobs', f'{self.pk}.jsonl')
+
+    def owned(self):
+        """
+        This job while it is still running the current attempt, i.e. it was
+        not given to another worker after its lease expired.
+        """
+        return Job.objects.filter(pk=self.pk, status=Job.RUNNING, attempts=self.attempts)
+
+    def set_progress(self, progress):
+        """
+        Store the progress and renew the lease of the running job, also when
+        called inside a transaction on PostgreSQL (SQLite allows only one
+        writer, a second connection would wait for the transaction).
+        """
+        self.progress = max(0, min(100, int(progress)))
+        self.locked_until = get_lease_expiry()
+        if connection.in_atomic_block and connection.vendor == 'postgresql':
+            _progress_writer.submit(_store_progress_in_thread, self).result()
+        else:
+            self._store_progress()
+
+    def _store_progress(self):
+        self.owned().update(progress=self.progress, locked_until=self.locked_until)
+
+
+def _store_progress_in_thread(job):
+    # Replace the writer thread's connection if it broke or is too old
+    close_old_connections()
+    job._store_progress()
@@ -0,0 +1,21 @@
+tasks = {}
+
+
+def task(name, concurrency=None, payload_serializer=None):
+    """
+    Register a background task under `name`.
+
+    The function is called as `func(job, **job.payload)`; `concurrency`
+    limits how many jobs of this task may run at the same time. Long tasks
+    must call `job.set_progress()` at least every JOBS['LEASE'] seconds,
+    otherwise the job is considered lost and given to another worker.
+    `payload_serializer` validates the payload when the job is submitted.
+    """
+
+    def decorator(func):
+        func.concurrency = concurrency
+        func.payload_serializer = payload_serializer
+        tasks[name] = func
+        return func
+
+    return decorator
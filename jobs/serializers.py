@@ -0,0 +1,66 @@
+import inspect
+
+from rest_framework import serializers
+
+from jobs.models import Job
+from jobs.registry import tasks
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            'id',
+            'task',
+            'payload',
+            'status',
+            'progress',
+            'result',
+            'error',
+            'attempts',
+            'max_attempts',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+        read_only_fields = [
+            'status',
+            'progress',
+            'result',
+            'error',
+            'attempts',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+
+    def validate_task(self, value):
+        if value not in tasks:
+            raise serializers.ValidationError(f"Unknown task: {value}")
+        return value
+
+    def validate(self, attrs):
+        # Reject payloads the task can not be called with before any attempt runs
+        func = tasks[attrs['task']]
+        payload = attrs.get('payload', {})
+        if not isinstance(payload, dict):
+            raise serializers.ValidationError({'payload': "Expected an object with the task arguments."})
+        try:
+            inspect.signature(func).bind(None, **payload)
+        except TypeError as exc:
+            raise serializers.ValidationError({'payload': str(exc)})
+        if func.payload_serializer is not None:
+            serializer = func.payload_serializer(data=payload)
+            if not serializer.is_valid():
+                raise serializers.ValidationError({'payload': serializer.errors})
+        return attrs
+
+
+class JobSchemaSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            'task',
+            'payload',
+            'max_attempts',
+        ]
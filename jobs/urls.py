@@ -0,0 +1,8 @@
+from django.urls import path
+from jobs import views
+
+urlpatterns = [
+    path('jobs/', views.JobList.as_view(), name='job-list'),
+    path('jobs/<int:pk>/', views.JobDetail.as_view(), name='job'),
+    path('jobs/<int:pk>/file/', views.JobFile.as_view(), name='job-file'),
+]
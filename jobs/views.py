@@ -0,0 +1,78 @@
+import os
+
+from django.http import FileResponse, Http404
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.views import LeanAPIView
+from jobs.models import Job
+from jobs.serializers import JobSerializer, JobSchemaSerializer
+
+
+class JobList(LeanAPIView):
+    """
+    Submit a background job
+    """
+
+    @extend_schema(
+        request=JobSchemaSerializer,
+        responses=JobSerializer,
+        summary="Submit job."
+    )
+    def post(self, request):
+        serializer = JobSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class JobDetail(LeanAPIView):
+    """
+    Poll a background job
+    """
+
+    def get_object(self, pk):
+        try:
+            return Job.objects.get(pk=pk)
+        except Job.DoesNotExist:
+            raise Http404
+
+    @extend_schema(
+        responses=JobSerializer,
+        summary="Get job by ID."
+    )
+    def get(self, request, pk):
+        job = self.get_object(pk)
+        serializer = JobSerializer(job)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class JobFile(LeanAPIView):
+    """
+    Download the file produced by a finished job
+    """
+
+    def get_object(self, pk):
+        try:
+            job = Job.objects.get(pk=pk, status=Job.DONE)
+        except Job.DoesNotExist:
+            raise Http404
+        if not os.path.exists(job.get_file_path()):
+            raise Http404
+        return job
+
+    @extend_schema(
+        responses={(200, 'application/jsonl'): OpenApiTypes.BINARY},
+        summary="Download job file."
+    )
+    def get(self, request, pk):
+        job = self.get_object(pk)
+        return FileResponse(
+            open(job.get_file_path(), 'rb'), as_attachment=True,
+            filename=f'{job.task}-{job.pk}.jsonl', content_type='application/jsonl'
+        )
@@ -0,0 +1,123 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from jobs.models import Job, get_lease_expiry
+from jobs.registry import tasks
+
+logger = logging.getLogger(__name__)
+
+CLAIM_LOCK = 'jobs.claim_job'
+
+
+def claim_job():
+    """
+    Lock the oldest runnable job whose task is under its concurrency limit
+    and mark it as running. Returns None when there is nothing to do.
+
+    Claims are serialized with a transaction-level advisory lock on
+    PostgreSQL, otherwise two workers could both count no running jobs of a
+    task and each claim one of them.
+    """
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [CLAIM_LOCK])
+        release_expired_jobs()
+        running = dict(
+            Job.objects.filter(status=Job.RUNNING)
+            .values_list('task')
+            .annotate(count=Count('id'))
+        )
+        blocked = [
+            name for name, func in tasks.items()
+            if func.concurrency is not None and running.get(name, 0) >= func.concurrency
+        ]
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.PENDING, run_after__lte=timezone.now())
+            .exclude(task__in=blocked)
+            .order_by('run_after', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = Job.RUNNING
+        job.attempts += 1
+        job.started_at = timezone.now()
+        job.locked_until = get_lease_expiry()
+        job.save(update_fields=['status', 'attempts', 'started_at', 'locked_until'])
+    return job
+
+
+def release_expired_jobs():
+    """
+    Requeue running jobs whose worker stopped renewing the lease (killed or
+    lost its database connection), or fail them after the last attempt.
+    """
+    now = timezone.now()
+    expired = Job.objects.filter(status=Job.RUNNING, locked_until__lt=now)
+    error = "Lease expired, the worker running the job was lost"
+    requeued = expired.filter(attempts__lt=F('max_attempts')).update(
+        status=Job.PENDING, error=error, run_after=now, locked_until=None
+    )
+    failed = expired.update(status=Job.FAILED, error=error, finished_at=now, locked_until=None)
+    if requeued or failed:
+        logger.warning("Released expired jobs: %s requeued, %s failed", requeued, failed)
+
+
+def execute_job(job):
+    func = tasks.get(job.task)
+    try:
+        if func is None:
+            raise LookupError(f"Unknown task: {job.task}")
+        result = func(job, **job.payload)
+    except Exception:
+        job.error = traceback.format_exc()
+        if func is not None and job.attempts < job.max_attempts:
+            delay = settings.JOBS['RETRY_DELAY'] * 2 ** (job.attempts - 1)
+            job.status = Job.PENDING
+            job.run_after = timezone.now() + timedelta(seconds=delay)
+        else:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+        logger.exception("Job %s (%s) failed on attempt %s", job.pk, job.task, job.attempts)
+    else:
+        job.status = Job.DONE
+        job.progress = 100
+        job.result = result
+        job.error = ''
+        job.finished_at = timezone.now()
+    job.locked_until = None
+    fields = ['status', 'progress', 'result', 'error', 'run_after', 'finished_at', 'locked_until']
+    if not job.owned().update(**{field: getattr(job, field) for field in fields}):
+        logger.warning("Job %s (%s) lost its lease, attempt %s is discarded", job.pk, job.task, job.attempts)
+    return job
+
+
+def run_pending():
+    """
+    Execute runnable jobs until the queue is empty.
+    """
+    while (job := claim_job()) is not None:
+        execute_job(job)
+
+
+def run_worker(stop_event):
+    poll_interval = settings.JOBS['POLL_INTERVAL']
+    while not stop_event.is_set():
+        try:
+            close_old_connections()
+            job = claim_job()
+            if job is not None:
+                execute_job(job)
+                continue
+        except Exception:
+            # E.g. the database went away, a claimed job is released when its lease expires
+            logger.exception("Job worker error, retrying in %s s", poll_interval)
+        stop_event.wait(poll_interval)
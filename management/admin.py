@@ -1,4 +1,40 @@
 from django.contrib import admin
+from django.urls import reverse
+from django.utils.html import format_html
+
 from management.models import Product, Company
-# Register your models here.
-admin.site.register([Product, Company])
\ No newline at end of file
+from management.paginators import EstimatedCountPaginator
+
+
+@admin.register(Product)
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ('id', 'identity_product', 'title', 'price', 'quantity', 'attachment')
+    list_select_related = ('attachment',)
+    # Exact identity uses the unique index ('=' would compare case-insensitively
+    # and scan the table), the prefix is served by product_title_idx, which is case-sensitive
+    search_fields = ('identity_product__exact', 'title__startswith')
+    search_help_text = "Exact identity or the beginning of the title (case-sensitive)."
+    autocomplete_fields = ('attachment',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        # The whole term is one title prefix instead of separate words
+        search_term = search_term.replace('"', '').strip()
+        if search_term:
+            search_term = f'"{search_term}"'
+        return super().get_search_results(request, queryset, search_term)
+
+
+@admin.register(Company)
+class CompanyAdmin(admin.ModelAdmin):
+    list_display = ('id', 'identity_company', 'title', 'location', 'schedule', 'products')
+    search_fields = ('identity_company__exact', 'title')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @admin.display(description="Products")
+    def products(self, company):
+        # Replaces a company list filter on products, which would load every company
+        url = reverse('admin:management_product_changelist')
+        return format_html('<a href="{}?attachment__id__exact={}">Products</a>', url, company.pk)
@@ -0,0 +1,128 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.caches import is_shared_cache
+from management.models import Company
+
+
+class CompanyCache:
+    """
+    Per-process read-through LRU of companies keyed by id and identity.
+
+    Any change of a company bumps a version counter in the shared cache;
+    every worker compares it with its own at most once per
+    VERSION_CHECK_INTERVAL seconds and drops its snapshots when it differs.
+    Callers get copies, so cached instances are never modified.
+
+    Without a shared default cache other workers never see the version, so
+    companies are then always read from the database.
+    """
+    VERSION_KEY = 'company-cache:version'
+
+    def __init__(self, maxsize, version_check_interval):
+        self.maxsize = maxsize
+        self.version_check_interval = version_check_interval
+        self.hits = 0
+        self.misses = 0
+        self._companies = OrderedDict()
+        self._identities = {}
+        self._version = None
+        self._version_checked = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return is_shared_cache()
+
+    def get(self, pk):
+        """
+        Company by primary key or None if it does not exist.
+        """
+        if not self.enabled:
+            return Company.objects.filter(pk=pk).first()
+        with self._lock:
+            self._check_version()
+            company = self._lookup(pk)
+        if company is not None:
+            return company
+        return self._load(Company.objects.filter(pk=pk))
+
+    def get_by_identity(self, identity):
+        if not self.enabled:
+            return Company.objects.filter(identity_company=identity).first()
+        with self._lock:
+            self._check_version()
+            company = self._lookup(self._identities.get(str(identity)))
+        if company is not None:
+            return company
+        return self._load(Company.objects.filter(identity_company=identity))
+
+    def _lookup(self, pk):
+        company = self._companies.get(pk)
+        if company is None:
+            self.misses += 1
+            return None
+        self._companies.move_to_end(pk)
+        self.hits += 1
+        return copy.copy(company)
+
+    def _load(self, queryset):
+        version = self._version
+        company = queryset.first()
+        if company is None:
+            return None
+        with self._lock:
+            # Skip snapshots loaded before an invalidation
+            if version == self._version:
+                self._add(company)
+        return copy.copy(company)
+
+    def _add(self, company):
+        self._companies[company.pk] = company
+        self._companies.move_to_end(company.pk)
+        self._identities[str(company.identity_company)] = company.pk
+        while len(self._companies) > self.maxsize:
+            _, evicted = self._companies.popitem(last=False)
+            self._identities.pop(str(evicted.identity_company), None)
+
+    def _check_version(self):
+        now = time.monotonic()
+        if now - self._version_checked < self.version_check_interval:
+            return
+        self._version_checked = now
+        version = cache.get(self.VERSION_KEY)
+        if version != self._version:
+            self._clear()
+            self._version = version
+
+    def _clear(self):
+        self._companies.clear()
+        self._identities.clear()
+
+    def invalidate(self):
+        """
+        Drop the snapshots of this process and tell the other workers to.
+        """
+        if not cache.add(self.VERSION_KEY, 1, None):
+            try:
+                cache.incr(self.VERSION_KEY)
+            except ValueError:
+                cache.set(self.VERSION_KEY, 1, None)
+        with self._lock:
+            self._clear()
+            self._version = cache.get(self.VERSION_KEY)
+            self._version_checked = time.monotonic()
+
+    def stats(self):
+        return {'enabled': self.enabled, 'hits': self.hits, 'misses': self.misses, 'size': len(self._companies)}
+
+
+company_cache = CompanyCache(
+    maxsize=settings.COMPANY_CACHE['MAX_SIZE'],
+    version_check_interval=settings.COMPANY_CACHE['VERSION_CHECK_INTERVAL'],
+)
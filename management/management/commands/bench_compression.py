@@ -0,0 +1,74 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from core.compression import COMPRESSORS, compress, compress_sequence
+from management.models import Product, Company
+from management.serializers import ProductDetailSerializer
+
+WORDS = (
+    "fresh organic premium delivery warranty steel cotton wireless battery "
+    "portable classic modern durable compact kitchen garden office sport"
+).split()
+
+LEVELS = {
+    'gzip': [1, 5, 6, 9],
+    'br': [1, 4, 6, 11],
+    'zstd': [1, 3, 6, 12],
+}
+
+
+def _text(words):
+    return ' '.join(random.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+class Command(BaseCommand):
+    help = "Measure compression CPU cost and bytes saved on generated catalog pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help="Products per page")
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        random.seed(0)
+        companies = [
+            Company(
+                id=pk, identity_company=f'company-{pk}', title=_text(3), description=_text(40),
+                location=_text(4), schedule='8:30-17:30',
+            )
+            for pk in range(1, 11)
+        ]
+        products = [
+            Product(
+                id=pk, identity_product=f'product-{pk}', title=_text(4), description=_text(60),
+                price=random.randint(1, 10000), quantity=random.randint(0, 500),
+                attachment=random.choice(companies),
+            )
+            for pk in range(1, options['limit'] + 1)
+        ]
+        content = JSONRenderer().render(ProductDetailSerializer(products, many=True).data)
+        chunks = [content[i:i + 4096] for i in range(0, len(content), 4096)]
+        self.stdout.write(f"Page of {options['limit']} products: {len(content)} bytes")
+
+        for encoding in COMPRESSORS:
+            for level in LEVELS[encoding]:
+                self.report(encoding, level, content, chunks, options['iterations'])
+
+    def report(self, encoding, level, content, chunks, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            compressed = compress(content, encoding, level)
+        elapsed = (time.perf_counter() - start) / iterations * 1000
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            streamed = b''.join(compress_sequence(chunks, encoding, level))
+        streaming_elapsed = (time.perf_counter() - start) / iterations * 1000
+
+        self.stdout.write(
+            f"{encoding:>4} level {level:>2}: {len(compressed):>7} bytes "
+            f"({len(compressed) / len(content):.1%}), {elapsed:.3f} ms; "
+            f"streaming {len(streamed):>7} bytes, {streaming_elapsed:.3f} ms"
+        )
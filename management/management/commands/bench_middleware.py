@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Measure per-request overhead of the full and the lean API middleware profiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        url = reverse('company-list')
+
+        with override_settings(ALLOWED_HOSTS=['*']), transaction.atomic():
+            client = Client()
+            client.force_login(CustomUser.objects.create_user('bench-middleware@example.com', 'bench-password'))
+
+            with override_settings(LEAN_API={'PATH_PREFIXES': []}):
+                self.report('Full profile', client, url, iterations)
+            self.report('Lean profile', client, url, iterations)
+
+            transaction.set_rollback(True)
+
+    def report(self, name, client, url, iterations):
+        client.get(url)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            client.get(url)
+        elapsed = (time.perf_counter() - start) / iterations * 1000
+        self.stdout.write(f"{name}: {elapsed:.3f} ms/request")
@@ -0,0 +1,55 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from management.models import Product, Company
+from management.partitioning import TABLE, get_partitions, is_partitioned
+
+
+class Command(BaseCommand):
+    help = "Measure per-company product list latency and vacuum time of the product table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--limit', type=int, default=10)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("The benchmark requires PostgreSQL")
+
+        company_ids = list(Company.objects.values_list('id', flat=True))
+        if not company_ids:
+            raise CommandError("There are no companies to benchmark")
+
+        with connection.cursor() as cursor:
+            layout = 'partitioned' if is_partitioned(cursor) else 'single table'
+        self.stdout.write(f"Layout: {layout}, {Product.objects.count()} products, {len(company_ids)} companies")
+
+        random.seed(0)
+        start = time.perf_counter()
+        for _ in range(options['iterations']):
+            # Same queries as CompanyDetailSerializer.get_paginated_products
+            products = Product.objects.filter(attachment_id=random.choice(company_ids)).order_by('id')
+            products.count()
+            list(products[:options['limit']])
+        elapsed = (time.perf_counter() - start) / options['iterations'] * 1000
+        self.stdout.write(f"Per-company list: {elapsed:.3f} ms/request")
+
+        with connection.cursor() as cursor:
+            start = time.perf_counter()
+            cursor.execute(f'VACUUM (ANALYZE) {TABLE}')
+            self.stdout.write(f"VACUUM (ANALYZE) {TABLE}: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+            # Autovacuum processes partitions one by one
+            timings = []
+            for partition in get_partitions(cursor):
+                start = time.perf_counter()
+                cursor.execute(f'VACUUM (ANALYZE) {partition}')
+                timings.append((time.perf_counter() - start) * 1000)
+            if timings:
+                self.stdout.write(
+                    f"VACUUM (ANALYZE) per partition: {sum(timings) / len(timings):.1f} ms average, "
+                    f"{max(timings):.1f} ms max"
+                )
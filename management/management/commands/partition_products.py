@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from management.partitioning import get_partitions, partition_products, unpartition_products
+
+
+class Command(BaseCommand):
+    help = "Convert the product table to hash partitions by company, or back with --revert"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--partitions', type=int, default=settings.PRODUCT_PARTITIONS)
+        parser.add_argument('--revert', action='store_true', help="Convert back to a plain table")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Partitioning requires PostgreSQL")
+
+        with connection.cursor() as cursor:
+            try:
+                if options['revert']:
+                    unpartition_products(cursor)
+                    self.stdout.write("Products are stored in a single table")
+                else:
+                    if options['partitions'] < 2:
+                        raise CommandError("Set --partitions or PRODUCT_PARTITIONS to 2 or more")
+                    partition_products(cursor, options['partitions'])
+                    self.stdout.write(f"Products are partitioned into {len(get_partitions(cursor))} tables")
+            except ValueError as error:
+                raise CommandError(error)
+        self.stdout.write("Restart the web and job worker processes to apply the new layout")
@@ -4,6 +4,8 @@ from django.db import models
 
 
 class Product(models.Model):
+    # While the table is hash partitioned by company (management/partitioning.py)
+    # the database enforces unique id and identity_product only per company
     identity_product = models.CharField(
         max_length=100, null=True, unique=True, default=uuid.uuid4,
         verbose_name="Unique identity of product"
@@ -20,6 +22,10 @@ class Product(models.Model):
     class Meta:
         verbose_name = "Product"
         verbose_name_plural = "Products"
+        indexes = [
+            # Serves prefix search (title__startswith) in the admin
+            models.Index(fields=['title'], name='product_title_idx', opclasses=['varchar_pattern_ops']),
+        ]
 
     def __str__(self):
         return f"UNIQUE_ID: {self.identity_product} - title: {self.title}"
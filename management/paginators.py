@@ -1,10 +1,44 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
 from rest_framework.pagination import LimitOffsetPagination
 
 
 class CustomPaginator(LimitOffsetPagination):
     default_limit = 10
+    max_limit = 1000
 
 
 class ProductPaginator(CustomPaginator):
     limit_query_param = 'product_limit'
     offset_query_param = 'product_offset'
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Django paginator for the admin that takes the row count of unfiltered
+    querysets from PostgreSQL planner statistics instead of COUNT(*).
+
+    Autovacuum never analyzes a partitioned table itself, so its estimate is
+    the sum over its partitions.
+    """
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT CASE WHEN c.relkind = 'p' THEN ("
+                    "    SELECT COALESCE(SUM(GREATEST(p.reltuples, 0)), 0) FROM pg_inherits i"
+                    "    JOIN pg_class p ON p.oid = i.inhrelid WHERE i.inhparent = c.oid"
+                    ") ELSE c.reltuples END::bigint FROM pg_class c WHERE c.oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.estimate_threshold:
+                return row[0]
+        return super().count
@@ -0,0 +1,157 @@
+"""
+Conversion of the product table between a plain heap table and PostgreSQL
+hash partitions by company (`attachment_id`).
+
+A partitioned table must include the partition key in its primary key and
+unique constraints, so while partitioned they become (id, attachment_id)
+and (identity_product, attachment_id), products must have a company and
+`id` is filled from a sequence instead of an identity column.
+"""
+import functools
+import re
+
+from django.db import connection, transaction
+
+from management.models import Product
+
+TABLE = Product._meta.db_table
+KEY = Product._meta.get_field('attachment').column
+OLD_TABLE = f'{TABLE}_old'
+
+
+def is_partitioned(cursor):
+    cursor.execute(
+        'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))',
+        [TABLE],
+    )
+    return cursor.fetchone()[0]
+
+
+@functools.cache
+def products_partitioned():
+    """
+    Whether the product table is partitioned, checked once per process;
+    processes started before a conversion must be restarted.
+    """
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        return is_partitioned(cursor)
+
+
+def get_partitions(cursor):
+    cursor.execute(
+        'SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = to_regclass(%s) ORDER BY 1',
+        [TABLE],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _get_constraints(cursor, table):
+    cursor.execute(
+        "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f')",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def _get_indexes(cursor, table):
+    # Indexes not backing a primary key or unique constraint
+    cursor.execute(
+        "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i WHERE i.indrelid = %s::regclass "
+        "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)",
+        [table],
+    )
+    return [
+        re.sub(r' ON (ONLY )?\S+ USING ', f' ON {TABLE} USING ', row[0])
+        for row in cursor.fetchall()
+    ]
+
+
+def _get_max_id(cursor, table):
+    cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}')
+    return cursor.fetchone()[0]
+
+
+def _move_rows(cursor, constraints, indexes):
+    # The old table can only be dropped without pending deferred FK checks
+    cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+    cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {OLD_TABLE}')
+    cursor.execute(f'DROP TABLE {OLD_TABLE}')
+    for name, _, definition in constraints:
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+    for definition in indexes:
+        cursor.execute(definition)
+
+
+def partition_products(cursor, partitions):
+    """
+    Rebuild the product table as `partitions` hash partitions by company.
+    """
+    with transaction.atomic():
+        cursor.execute(f'LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE')
+        if is_partitioned(cursor):
+            raise ValueError(f"{TABLE} is already partitioned")
+        cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {TABLE} WHERE {KEY} IS NULL)')
+        if cursor.fetchone()[0]:
+            raise ValueError(f"{TABLE} has rows without {KEY}, they can not be partitioned")
+
+        constraints = [
+            (name, kind, re.sub(r'\)$', f', {KEY})', definition) if kind in 'pu' else definition)
+            for name, kind, definition in _get_constraints(cursor, TABLE)
+        ]
+        indexes = _get_indexes(cursor, TABLE)
+        max_id = _get_max_id(cursor, TABLE)
+
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}')
+        cursor.execute(
+            f'CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+            f'INCLUDING STORAGE) PARTITION BY HASH ({KEY})'
+        )
+        cursor.execute(f'ALTER TABLE {TABLE} ALTER COLUMN id DROP DEFAULT')
+        cursor.execute(f'ALTER TABLE {TABLE} ALTER COLUMN {KEY} SET NOT NULL')
+        for remainder in range(partitions):
+            cursor.execute(
+                f'CREATE TABLE {TABLE}_p{remainder} PARTITION OF {TABLE} '
+                f'FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})'
+            )
+        _move_rows(cursor, constraints, indexes)
+
+        cursor.execute(f'CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id')
+        cursor.execute(f"SELECT setval('{TABLE}_id_seq', %s, false)", [max_id + 1])
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')")
+    products_partitioned.cache_clear()
+
+
+def unpartition_products(cursor):
+    """
+    Rebuild the partitioned product table as a single plain table.
+    """
+    with transaction.atomic():
+        cursor.execute(f'LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE')
+        if not is_partitioned(cursor):
+            raise ValueError(f"{TABLE} is not partitioned")
+
+        constraints = [
+            (name, kind, re.sub(rf', {KEY}\)$', ')', definition) if kind in 'pu' else definition)
+            for name, kind, definition in _get_constraints(cursor, TABLE)
+        ]
+        indexes = _get_indexes(cursor, TABLE)
+        max_id = _get_max_id(cursor, TABLE)
+
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}')
+        cursor.execute(f'ALTER SEQUENCE {TABLE}_id_seq RENAME TO {OLD_TABLE}_id_seq')
+        cursor.execute(
+            f'CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+            f'INCLUDING STORAGE)'
+        )
+        cursor.execute(f'ALTER TABLE {TABLE} ALTER COLUMN id DROP DEFAULT')
+        cursor.execute(f'ALTER TABLE {TABLE} ALTER COLUMN {KEY} DROP NOT NULL')
+        _move_rows(cursor, constraints, indexes)
+
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY '
+            f'(START WITH {max_id + 1})'
+        )
+    products_partitioned.cache_clear()
@@ -1,10 +1,17 @@
 from rest_framework import serializers
 
+from management.caches import company_cache
 from management.models import Product, Company
 from management.paginators import ProductPaginator
+from management.partitioning import products_partitioned
 
 
 class ProductSerializer(serializers.ModelSerializer):
+    # Checked in the database rather than the company cache, whose snapshot may be stale
+    attachment = serializers.PrimaryKeyRelatedField(
+        queryset=Company.objects.all(), allow_null=True, required=False,
+    )
+
     class Meta:
         model = Product
         fields = [
@@ -17,6 +24,14 @@ class ProductSerializer(serializers.ModelSerializer):
             'attachment',
         ]
 
+    def get_fields(self):
+        fields = super().get_fields()
+        # Partitioned products are keyed by company and need one
+        if products_partitioned():
+            fields['attachment'].required = True
+            fields['attachment'].allow_null = False
+        return fields
+
 
 class ProductSchemaSerializer(serializers.ModelSerializer):
     class Meta:
@@ -60,7 +75,8 @@ class CompanyDetailSerializer(serializers.ModelSerializer):
 
     def get_paginated_products(self, obj):
         request = self.context['request']
-        products = obj.product_set.all()
+        # Filtering on attachment_id lets PostgreSQL prune product partitions
+        products = Product.objects.filter(attachment_id=obj.pk).order_by('id')
         paginator = ProductPaginator()
         paginated_products = paginator.paginate_queryset(products, request)
         serializer = ProductSerializer(paginated_products, many=True)
@@ -78,8 +94,20 @@ class CompanySchemaSerializer(serializers.ModelSerializer):
         ]
 
 
+class AttachmentSerializer(CompanySerializer):
+    """
+    Product company taken from the company cache instead of a query per product,
+    or from the product itself while the cache is disabled
+    """
+
+    def get_attribute(self, instance):
+        if instance.attachment_id is None or not company_cache.enabled:
+            return super().get_attribute(instance)
+        return company_cache.get(instance.attachment_id)
+
+
 class ProductDetailSerializer(serializers.ModelSerializer):
-    attachment = CompanySerializer()
+    attachment = AttachmentSerializer()
 
     class Meta:
         model = Product
@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from management.caches import company_cache
+from management.models import Company
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_company_cache(sender, instance, **kwargs):
+    # Again on commit, other workers may have cached the old row meanwhile
+    company_cache.invalidate()
+    transaction.on_commit(company_cache.invalidate)
@@ -0,0 +1,75 @@
+import json
+import os
+
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import serializers
+
+from jobs.registry import task
+from management.models import Product, Company
+from management.serializers import ProductSerializer
+
+BATCH_SIZE = 500
+
+
+class ImportProductsPayload(serializers.Serializer):
+    # Products themselves are validated by the job
+    products = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+
+
+class CompanyPayload(serializers.Serializer):
+    company_id = serializers.IntegerField()
+
+
+class ExportProductsPayload(serializers.Serializer):
+    company_id = serializers.IntegerField(required=False, allow_null=True)
+
+
+@task('import_products', concurrency=2, payload_serializer=ImportProductsPayload)
+def import_products(job, products):
+    serializer = ProductSerializer(data=products, many=True)
+    if not serializer.is_valid():
+        raise serializers.ValidationError(serializer.errors)
+    job.set_progress(50)
+
+    # One transaction so that a retried job never imports a batch twice,
+    # set_progress() writes through its own connection meanwhile
+    total = len(serializer.validated_data)
+    with transaction.atomic():
+        for start in range(0, total, BATCH_SIZE):
+            batch = serializer.validated_data[start:start + BATCH_SIZE]
+            Product.objects.bulk_create(Product(**data) for data in batch)
+            job.set_progress(50 + (start + len(batch)) * 50 / total)
+    return {'imported': total}
+
+
+@task('delete_company', concurrency=1, payload_serializer=CompanyPayload)
+def delete_company(job, company_id):
+    company = Company.objects.get(pk=company_id)
+    products = Product.objects.filter(attachment=company)
+    total = products.count()
+    deleted = 0
+    while ids := list(products.values_list('id', flat=True)[:BATCH_SIZE]):
+        deleted += Product.objects.filter(id__in=ids).delete()[0]
+        job.set_progress(deleted * 100 / (total + 1))
+    company.delete()
+    return {'deleted_products': deleted}
+
+
+@task('export_products', concurrency=1, payload_serializer=ExportProductsPayload)
+def export_products(job, company_id=None):
+    products = Product.objects.order_by('id')
+    if company_id is not None:
+        products = products.filter(attachment_id=company_id)
+    total = products.count()
+
+    path = job.get_file_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    exported = 0
+    with open(path, 'w') as file:
+        for product in products.iterator(chunk_size=BATCH_SIZE):
+            file.write(json.dumps(ProductSerializer(product).data) + '\n')
+            exported += 1
+            if exported % BATCH_SIZE == 0:
+                job.set_progress(exported * 100 / total)
+    return {'exported': exported, 'file': reverse('job-file', kwargs={'pk': job.pk})}
@@ -5,8 +5,10 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.views import APIView
 
+from core.views import LeanAPIView
+
+from management.caches import company_cache
 from management.models import Product, Company
 from management.serializers import (
     ProductSerializer,
@@ -20,7 +22,7 @@ from management.serializers import (
 from management.paginators import CustomPaginator
 
 
-class ProductList(APIView):
+class ProductList(LeanAPIView):
     """
     List all products of the company
     """
@@ -45,6 +47,8 @@ class ProductList(APIView):
     )
     def get(self, request):
         products = Product.objects.all()
+        if not company_cache.enabled:
+            products = products.select_related('attachment')
         paginator = CustomPaginator()
         paginated_products = paginator.paginate_queryset(products, request)
         serializer = ProductDetailSerializer(paginated_products, many=True)
@@ -58,18 +62,16 @@ class ProductList(APIView):
     def post(self, request):
         serializer = ProductSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
-            company_pk = serializer.data.get('attachment')
-            company = Company.objects.get(id=company_pk)
-            company_serializer = CompanySerializer(company)
+            product = serializer.save()
             result = dict()
             result.update(serializer.data)
-            result['attachment'] = company_serializer.data
+            if product.attachment is not None:
+                result['attachment'] = CompanySerializer(product.attachment).data
             return Response(result, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ProductDetail(APIView):
+class ProductDetail(LeanAPIView):
     """
     Retrieve, update and delete a product instance.
     """
@@ -124,7 +126,7 @@ class ProductDetail(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class CompanyList(APIView):
+class CompanyList(LeanAPIView):
     """
     List all the companies
     """
@@ -167,7 +169,7 @@ class CompanyList(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CompanyDetail(APIView):
+class CompanyDetail(LeanAPIView):
     """
     Retrieve, update and delete a company instance.
     """
@@ -197,7 +199,9 @@ class CompanyDetail(APIView):
         summary="Get company by ID."
     )
     def get(self, request, pk):
-        company = self.get_object(pk)
+        company = company_cache.get(pk)
+        if company is None:
+            raise Http404
         serializer = CompanyDetailSerializer(company, context={'request': request})
         return Response(serializer.data, status.HTTP_200_OK)
 
@@ -0,0 +1,94 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+
+from management.models import Company, Product
+from management.paginators import EstimatedCountPaginator
+from users.models import CustomUser
+
+
+class ProductAdminTest(TestCase):
+    def setUp(self):
+        self.client.force_login(CustomUser.objects.create_superuser('admin@example.com', 'admin-password'))
+        self.company = Company.objects.create(
+            title='Valid data',
+            description='Valid test data',
+            location='J 240 s.right',
+            schedule='8:30-17:30'
+        )
+        Product.objects.bulk_create(
+            Product(
+                title=f"Test case {i}",
+                description="Test case description",
+                price=100,
+                quantity=50,
+                attachment=self.company,
+            )
+            for i in range(20)
+        )
+        self.product = Product.objects.first()
+
+    def test_product_changelist(self):
+        url = reverse('admin:management_product_changelist')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, 'Test case 19')
+
+    def test_product_changelist_queries(self):
+        url = reverse('admin:management_product_changelist')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        Product.objects.bulk_create(
+            Product(title=f"More {i}", description="More", price=1, quantity=1, attachment=self.company)
+            for i in range(20)
+        )
+        with self.assertNumQueries(len(queries)):
+            self.client.get(url)
+
+    def test_product_search(self):
+        url = reverse('admin:management_product_changelist')
+        response = self.client.get(url, {'q': 'Test case 1'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.context['cl'].result_count, 11)
+
+    def test_product_search_lookups(self):
+        url = reverse('admin:management_product_changelist')
+        response = self.client.get(url, {'q': str(self.product.identity_product)})
+        self.assertEqual(response.context['cl'].result_count, 1)
+        # Plain comparisons that the unique index and product_title_idx can serve
+        sql = str(response.context['cl'].queryset.query)
+        self.assertIn('"management_product"."identity_product" = ', sql)
+        self.assertNotIn('UPPER(', sql)
+
+    def test_product_company_lookup(self):
+        url = reverse('admin:management_product_changelist')
+        response = self.client.get(url, {'attachment__id__exact': self.company.pk})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.context['cl'].result_count, 20)
+        self.assertNotContains(response, 'changelist-filter')
+
+    def test_company_changelist(self):
+        url = reverse('admin:management_company_changelist')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, f'?attachment__id__exact={self.company.pk}')
+
+    def test_company_search_lookups(self):
+        url = reverse('admin:management_company_changelist')
+        response = self.client.get(url, {'q': str(self.company.identity_company)})
+        self.assertEqual(response.context['cl'].result_count, 1)
+        self.assertIn('"management_company"."identity_company" = ', str(response.context['cl'].queryset.query))
+
+    def test_product_change_form(self):
+        product = Product.objects.first()
+        url = reverse('admin:management_product_change', args=[product.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, 'admin-autocomplete')
+
+    def test_estimated_count_paginator(self):
+        paginator = EstimatedCountPaginator(Product.objects.order_by('pk'), 10)
+        self.assertEqual(paginator.count, 20)
@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from users.authentication import CachedTokenAuthentication, get_token_cache_key
+from users.models import CustomUser
+
+
+class TokenAuthApiTest(APITestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user('test@example.com', 'test-password')
+
+    def test_obtain_token(self):
+        url = reverse('token')
+        response = self.client.post(url, {'username': 'test@example.com', 'password': 'test-password'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['token'], Token.objects.get(user=self.user).key)
+
+    def test_token_authentication(self):
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        response = self.client.get(reverse('company-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_revoked_token(self):
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertEqual(self.client.get(reverse('company-list')).status_code, status.HTTP_200_OK)
+        token.delete()
+        response = self.client.get(reverse('company-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_inactive_user(self):
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertEqual(self.client.get(reverse('company-list')).status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(reverse('company-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_local_cache_not_used_as_shared_tier(self):
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertEqual(self.client.get(reverse('company-list')).status_code, status.HTTP_200_OK)
+        self.assertIsNone(cache.get(get_token_cache_key(token.key)))
+
+    def test_shared_tier(self):
+        token = Token.objects.create(user=self.user)
+        self.addCleanup(cache.clear)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        with mock.patch('users.authentication.is_shared_cache', return_value=True):
+            self.assertEqual(self.client.get(reverse('company-list')).status_code, status.HTTP_200_OK)
+        self.assertEqual(cache.get(get_token_cache_key(token.key)).user, self.user)
+
+    def test_cached_user_is_copied(self):
+        token = Token.objects.create(user=self.user)
+        authentication = CachedTokenAuthentication()
+        user, _ = authentication.authenticate_credentials(token.key)
+        user._perm_cache = {'management.delete_company'}
+        cached_user, cached_token = authentication.authenticate_credentials(token.key)
+        self.assertIsNot(cached_user, user)
+        self.assertIs(cached_token.user, cached_user)
+        self.assertFalse(hasattr(cached_user, '_perm_cache'))
@@ -0,0 +1,136 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from management.caches import CompanyCache, company_cache
+from management.models import Company, Product
+
+
+# The per-process test cache stands in for a shared one
+shared_cache = mock.patch('management.caches.is_shared_cache', lambda: True)
+
+
+@shared_cache
+class CompanyCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.company_cache = CompanyCache(maxsize=2, version_check_interval=0)
+        self.companies = [
+            Company.objects.create(
+                title=f"Test case {i}",
+                description="Test case description",
+                location="L 120 right and left",
+                schedule="8:00-17:00"
+            )
+            for i in range(3)
+        ]
+
+    def test_read_through(self):
+        company = self.companies[0]
+        self.assertEqual(self.company_cache.get(company.pk).title, company.title)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.company_cache.get(company.pk).title, company.title)
+            self.assertEqual(self.company_cache.get_by_identity(company.identity_company).pk, company.pk)
+        self.assertEqual(self.company_cache.stats(), {'enabled': True, 'hits': 2, 'misses': 1, 'size': 1})
+
+    def test_missing(self):
+        self.assertIsNone(self.company_cache.get(0))
+        self.assertIsNone(self.company_cache.get_by_identity('missing'))
+
+    def test_lru_eviction(self):
+        for company in self.companies:
+            self.company_cache.get(company.pk)
+        self.assertEqual(self.company_cache.stats()['size'], 2)
+        with self.assertNumQueries(1):
+            self.company_cache.get(self.companies[0].pk)
+
+    def test_invalidation(self):
+        company = self.companies[0]
+        self.company_cache.get(company.pk)
+        company.title = 'Updated title'
+        company.save()
+        self.assertEqual(self.company_cache.get(company.pk).title, 'Updated title')
+
+    def test_returns_copies(self):
+        company = self.companies[0]
+        self.company_cache.get(company.pk).title = 'Changed'
+        self.assertEqual(self.company_cache.get(company.pk).title, company.title)
+
+
+class CompanyCacheDisabledTest(TestCase):
+    def test_reads_database(self):
+        company = Company.objects.create(
+            title="Test case",
+            description="Test case description",
+            location="L 120 right and left",
+            schedule="8:00-17:00"
+        )
+        company_cache = CompanyCache(maxsize=2, version_check_interval=0)
+        with self.assertNumQueries(2):
+            self.assertEqual(company_cache.get(company.pk).pk, company.pk)
+            self.assertEqual(company_cache.get_by_identity(company.identity_company).pk, company.pk)
+        self.assertEqual(company_cache.stats()['size'], 0)
+
+
+class CompanyCacheApiTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.company = company = Company.objects.create(
+            title='Valid data',
+            description='Valid test data',
+            location='J 240 s.right',
+            schedule='8:30-17:30'
+        )
+        Product.objects.bulk_create(
+            Product(
+                title=f"Test case {i}",
+                description="Test case description",
+                price=100,
+                quantity=50,
+                attachment=company,
+            )
+            for i in range(10)
+        )
+
+    @shared_cache
+    def test_product_list_queries(self):
+        url = reverse('product-list')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertFalse([query for query in queries if 'management_company' in query['sql']])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['attachment']['title'], 'Valid data')
+
+    def test_product_list_without_shared_cache(self):
+        url = reverse('product-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(len([query for query in queries if 'management_company' in query['sql']]), 1)
+        self.assertEqual(response.data[0]['attachment']['title'], 'Valid data')
+
+    @shared_cache
+    def test_create_product_with_deleted_cached_company(self):
+        pk = self.company.pk
+        company_cache.get(pk)
+        # Deleted by another worker, this one has not seen the new version yet
+        with mock.patch.object(company_cache, 'invalidate'):
+            self.company.delete()
+        self.assertIsNotNone(company_cache.get(pk))
+        data = {
+            'title': 'New product',
+            'description': 'New product description',
+            'price': 100,
+            'quantity': 5,
+            'attachment': pk,
+        }
+        response = self.client.post(reverse('product-list'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['attachment'][0].code, 'does_not_exist')
@@ -0,0 +1,78 @@
+import gzip
+
+import brotli
+import zstandard
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.compression import choose_encoding
+from core.middleware import CompressionMiddleware
+from management.models import Company
+
+CONTENT = b'{"title": "Test case", "description": "Test case description"}' * 100
+
+
+class CompressionMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def get_response(self, response, accept_encoding='gzip'):
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding('gzip, deflate', ['zstd', 'br', 'gzip']), 'gzip')
+        self.assertEqual(choose_encoding('gzip;q=0.5, *;q=0', ['gzip']), 'gzip')
+        self.assertIsNone(choose_encoding('identity', ['gzip']))
+        self.assertIsNone(choose_encoding('gzip;q=0', ['gzip']))
+
+    def test_compress(self):
+        response = self.get_response(HttpResponse(CONTENT, content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(response.content), CONTENT)
+
+    def test_compress_streaming(self):
+        chunks = [CONTENT[i:i + 100] for i in range(0, len(CONTENT), 100)]
+        response = self.get_response(StreamingHttpResponse(chunks, content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), CONTENT)
+
+    def test_skip_small_body(self):
+        response = self.get_response(HttpResponse(b'{}', content_type='application/json'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_skip_html(self):
+        response = self.get_response(HttpResponse(CONTENT, content_type='text/html'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_compress_zstd(self):
+        response = self.get_response(HttpResponse(CONTENT, content_type='application/json'), 'gzip, br, zstd')
+        self.assertEqual(response['Content-Encoding'], 'zstd')
+        self.assertEqual(zstandard.ZstdDecompressor().decompressobj().decompress(response.content), CONTENT)
+
+    def test_compress_brotli(self):
+        response = self.get_response(HttpResponse(CONTENT, content_type='application/json'), 'gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), CONTENT)
+
+
+class CompressionApiTest(APITestCase):
+    def test_compressed_list(self):
+        Company.objects.bulk_create(
+            Company(
+                title=f"Test case {i}",
+                description="Test case description",
+                location="L 120 right and left",
+                schedule="8:00-17:00"
+            )
+            for i in range(10)
+        )
+        response = self.client.get(reverse('company-list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
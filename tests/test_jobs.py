@@ -0,0 +1,206 @@
+import json
+import tempfile
+import threading
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jobs.models import Job, _progress_writer
+from jobs.registry import task
+from jobs.worker import claim_job, execute_job, run_pending, run_worker
+from management.models import Company, Product
+
+
+@task('test_failing')
+def failing_task(job):
+    raise RuntimeError("Failed")
+
+
+class JobApiTest(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        # import_products writes progress through the writer thread on PostgreSQL,
+        # the test database can only be dropped once that thread disconnects
+        _progress_writer.submit(connections.close_all).result()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.company = Company.objects.create(
+            title="Test case",
+            description="Test case description",
+            location="L 120 right and left",
+            schedule="8:00-17:00"
+        )
+        self.test_data = {
+            'task': 'import_products',
+            'payload': {
+                'products': [
+                    {
+                        'title': f'Product {i}',
+                        'description': 'Imported product',
+                        'price': 100,
+                        'quantity': 5,
+                        'attachment': self.company.pk,
+                    }
+                    for i in range(3)
+                ],
+            },
+        }
+
+    def test_submit_job(self):
+        url = reverse('job-list')
+        response = self.client.post(url, self.test_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], Job.PENDING)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_submit_unknown_task(self):
+        url = reverse('job-list')
+        response = self.client.post(url, {'task': 'unknown'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Job.objects.count(), 0)
+
+    def test_submit_invalid_payload(self):
+        url = reverse('job-list')
+        payloads = [
+            [self.company.pk],
+            {'product': self.test_data['payload']['products']},
+            {'products': self.test_data['payload']['products'][0]},
+        ]
+        for payload in payloads:
+            response = self.client.post(url, {'task': 'import_products', 'payload': payload}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('payload', response.data)
+        self.assertEqual(Job.objects.count(), 0)
+
+    def test_poll_job(self):
+        job = Job.objects.create(**self.test_data)
+        run_pending()
+        url = reverse('job', kwargs={'pk': job.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], Job.DONE)
+        self.assertEqual(response.data['progress'], 100)
+        self.assertEqual(response.data['result'], {'imported': 3})
+        self.assertEqual(Product.objects.count(), 3)
+
+    def test_delete_company_job(self):
+        Job.objects.create(**self.test_data)
+        Job.objects.create(task='delete_company', payload={'company_id': self.company.pk})
+        run_pending()
+        self.assertEqual(Company.objects.count(), 0)
+        self.assertEqual(Product.objects.count(), 0)
+
+    def test_export_job_file(self):
+        Job.objects.create(**self.test_data)
+        job = Job.objects.create(task='export_products', payload={'company_id': self.company.pk})
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            run_pending()
+            job.refresh_from_db()
+            url = reverse('job-file', kwargs={'pk': job.pk})
+            self.assertEqual(job.result, {'exported': 3, 'file': url})
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines], ['Product 0', 'Product 1', 'Product 2'])
+
+    def test_job_file_not_ready(self):
+        job = Job.objects.create(task='export_products')
+        response = self.client.get(reverse('job-file', kwargs={'pk': job.pk}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_retry_and_fail(self):
+        job = Job.objects.create(task='test_failing', max_attempts=2)
+        execute_job(claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertGreater(job.run_after, job.started_at)
+
+        Job.objects.filter(pk=job.pk).update(run_after=job.started_at)
+        execute_job(claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIn('RuntimeError', job.error)
+
+    def test_concurrency_limit(self):
+        Job.objects.create(task='delete_company', payload={'company_id': self.company.pk}, status=Job.RUNNING)
+        Job.objects.create(task='delete_company', payload={'company_id': self.company.pk})
+        self.assertIsNone(claim_job())
+
+    def test_expired_lease_requeued(self):
+        expired = timezone.now() - timedelta(seconds=1)
+        job = Job.objects.create(
+            task='delete_company', payload={'company_id': self.company.pk},
+            status=Job.RUNNING, attempts=1, locked_until=expired,
+        )
+        claimed = claim_job()
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.attempts, 2)
+        self.assertGreater(claimed.locked_until, timezone.now())
+
+    def test_expired_lease_failed_after_last_attempt(self):
+        expired = timezone.now() - timedelta(seconds=1)
+        job = Job.objects.create(
+            task='delete_company', payload={'company_id': self.company.pk},
+            status=Job.RUNNING, attempts=3, locked_until=expired,
+        )
+        self.assertIsNone(claim_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn('Lease expired', job.error)
+
+    def test_lost_lease_result_discarded(self):
+        Job.objects.create(**self.test_data)
+        job = claim_job()
+        Job.objects.filter(pk=job.pk).update(attempts=job.attempts + 1)
+        execute_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.RUNNING)
+        self.assertIsNone(job.result)
+
+    def test_worker_survives_errors(self):
+        stop_event = threading.Event()
+        calls = []
+
+        def claim():
+            calls.append(None)
+            if len(calls) == 2:
+                stop_event.set()
+            raise RuntimeError("Database is unavailable")
+
+        with self.settings(JOBS={**settings.JOBS, 'POLL_INTERVAL': 0}), \
+                mock.patch('jobs.worker.claim_job', side_effect=claim), \
+                self.assertLogs('jobs.worker', 'ERROR'):
+            run_worker(stop_event)
+        self.assertEqual(len(calls), 2)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Progress inside transactions requires PostgreSQL")
+class JobProgressTest(TransactionTestCase):
+    def test_progress_visible_inside_transaction(self):
+        # The test database can only be dropped once the writer thread disconnects
+        self.addCleanup(lambda: _progress_writer.submit(connections.close_all).result())
+        Job.objects.create(task='export_products')
+        job = claim_job()
+
+        def poll():
+            progress.append(Job.objects.get(pk=job.pk).progress)
+            connection.close()
+
+        progress = []
+        with transaction.atomic():
+            job.set_progress(40)
+            poller = threading.Thread(target=poll)
+            poller.start()
+            poller.join()
+        self.assertEqual(progress, [40])
@@ -0,0 +1,30 @@
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class LeanApiTest(APITestCase):
+    def test_api_request_without_session(self):
+        response = self.client.get(reverse('company-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+        self.assertFalse(hasattr(response.wsgi_request, '_messages'))
+
+    def test_api_request_json_only(self):
+        response = self.client.get(reverse('company-list'), HTTP_ACCEPT='text/html,*/*')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_admin_request_with_session(self):
+        response = self.client.get(reverse('admin:login'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(hasattr(response.wsgi_request, 'session'))
+
+    @override_settings(LEAN_API={'PATH_PREFIXES': []})
+    def test_lean_api_disabled(self):
+        response = self.client.get(reverse('company-list'), HTTP_ACCEPT='text/html')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(hasattr(response.wsgi_request, 'session'))
+        self.assertIn('text/html', response['Content-Type'])
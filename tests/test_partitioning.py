@@ -0,0 +1,83 @@
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+
+from management.models import Company, Product
+from management.paginators import EstimatedCountPaginator
+from management.serializers import ProductSerializer
+from management.partitioning import (
+    get_partitions, is_partitioned, partition_products, products_partitioned, unpartition_products,
+)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Partitioning requires PostgreSQL")
+class ProductPartitioningTest(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(
+            title='Valid data',
+            description='Valid test data',
+            location='J 240 s.right',
+            schedule='8:30-17:30'
+        )
+        self.products = Product.objects.bulk_create(
+            Product(
+                title=f"Test case {i}",
+                description="Test case description",
+                price=100,
+                quantity=50,
+                attachment=self.company,
+            )
+            for i in range(10)
+        )
+
+    def test_partition_and_revert(self):
+        with connection.cursor() as cursor:
+            partition_products(cursor, 4)
+            self.assertTrue(is_partitioned(cursor))
+            self.assertEqual(len(get_partitions(cursor)), 4)
+
+        self.assertEqual(Product.objects.filter(attachment=self.company).count(), 10)
+        product = Product.objects.create(
+            title="New", description="New", price=1, quantity=1, attachment=self.company
+        )
+        self.assertGreater(product.pk, self.products[-1].pk)
+
+        with connection.cursor() as cursor:
+            unpartition_products(cursor)
+            self.assertFalse(is_partitioned(cursor))
+
+        self.assertEqual(Product.objects.count(), 11)
+        product = Product.objects.create(title="Without company", description="New", price=1, quantity=1)
+        self.assertIsNone(product.attachment_id)
+
+    def test_partition_without_company(self):
+        Product.objects.create(title="Without company", description="New", price=1, quantity=1)
+        with connection.cursor() as cursor:
+            with self.assertRaises(ValueError):
+                partition_products(cursor, 4)
+            self.assertFalse(is_partitioned(cursor))
+
+    def test_estimated_count(self):
+        with connection.cursor() as cursor:
+            partition_products(cursor, 4)
+            # Like autovacuum, which never analyzes the partitioned table itself
+            for partition in get_partitions(cursor):
+                cursor.execute(f'ANALYZE {partition}')
+        paginator = EstimatedCountPaginator(Product.objects.order_by('pk'), 10)
+        paginator.estimate_threshold = 1
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 10)
+
+    def test_attachment_required_while_partitioned(self):
+        data = {'title': "New", 'description': "New", 'price': 1, 'quantity': 1}
+        with connection.cursor() as cursor:
+            partition_products(cursor, 4)
+            self.assertTrue(products_partitioned())
+            serializer = ProductSerializer(data=data)
+            self.assertFalse(serializer.is_valid())
+            self.assertIn('attachment', serializer.errors)
+
+            unpartition_products(cursor)
+            self.assertFalse(products_partitioned())
+            self.assertTrue(ProductSerializer(data=data).is_valid())
@@ -0,0 +1,59 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.views import get_source_files, is_schema_file_fresh
+
+
+class SchemaApiTest(APITestCase):
+    def test_schema(self):
+        url = reverse('schema')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'openapi', response.content)
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_schema_not_modified(self):
+        url = reverse('schema')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_schema_gzip(self):
+        url = reverse('schema')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_schema_json(self):
+        url = reverse('schema')
+        response = self.client.get(url, HTTP_ACCEPT='application/vnd.oai.openapi+json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['info']['title'], 'Reviro Test API')
+
+
+class SchemaFileTest(APITestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.schema_file = Path(directory.name) / 'schema.yml'
+
+    def test_missing_schema_file(self):
+        self.assertFalse(is_schema_file_fresh(self.schema_file))
+
+    def test_fresh_schema_file(self):
+        self.schema_file.write_text('openapi: 3.0.3\n')
+        newest = max(path.stat().st_mtime for path in get_source_files())
+        os.utime(self.schema_file, (newest + 1, newest + 1))
+        self.assertTrue(is_schema_file_fresh(self.schema_file))
+
+    def test_stale_schema_file(self):
+        self.schema_file.write_text('openapi: 3.0.3\n')
+        os.utime(self.schema_file, (0, 0))
+        with self.assertLogs('core.views', 'WARNING'):
+            self.assertFalse(is_schema_file_fresh(self.schema_file))
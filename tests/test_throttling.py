@@ -0,0 +1,124 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.exceptions import QUERY_CANCELED
+from core.middleware import LoadSheddingMiddleware
+from core.throttling import CostRateThrottle
+from management.models import Company
+
+
+class QueryCanceled(Exception):
+    pgcode = QUERY_CANCELED
+
+
+def cancelled_query(*args):
+    raise OperationalError('canceling statement due to statement timeout') from QueryCanceled()
+
+
+@mock.patch.object(CostRateThrottle, 'THROTTLE_RATES', {'api': '5/min'})
+class ThrottlingApiTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_throttle(self):
+        url = reverse('company-list')
+        for _ in range(5):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertTrue(response.has_header('Retry-After'))
+
+    def test_throttle_cost(self):
+        url = reverse('product-list')
+        self.assertEqual(self.client.get(url, {'limit': 150}).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(url, {'limit': 50}).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    def test_throttle_cost_capped(self):
+        # A limit above max_limit is charged like a full page of 1000 rows
+        url = reverse('product-list')
+        with mock.patch.object(CostRateThrottle, 'THROTTLE_RATES', {'api': '22/min'}):
+            self.assertEqual(self.client.get(url, {'limit': 100000}).status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+class LoadSheddingApiTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.company = Company.objects.create(
+            title="Test case",
+            description="Test case description",
+            location="L 120 right and left",
+            schedule="8:00-17:00"
+        )
+
+    @override_settings(LOAD_SHEDDING=dict(
+        settings.LOAD_SHEDDING, URL_NAMES=['company-list'], QUERY_LATENCY_THRESHOLD=-1, QUERY_LATENCY_MIN_SAMPLES=1
+    ))
+    def test_load_shedding(self):
+        url = reverse('company-list')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '10')
+
+    @override_settings(LOAD_SHEDDING=dict(
+        settings.LOAD_SHEDDING, URL_NAMES=['company-list'], QUERY_LATENCY_THRESHOLD=-1, QUERY_LATENCY_MIN_SAMPLES=1
+    ))
+    def test_other_routes_not_measured(self):
+        url = reverse('company', kwargs={'pk': self.company.pk})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(reverse('company-list')).status_code, status.HTTP_200_OK)
+
+    def test_no_load_shedding(self):
+        url = reverse('company-list')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+
+class QueryLatencyTest(SimpleTestCase):
+    def setUp(self):
+        self.middleware = LoadSheddingMiddleware(lambda request: None)
+        # Only the latency signal, connection usage is read from PostgreSQL
+        self.middleware.get_connection_usage = lambda options: 0.0
+        self.request = mock.Mock(resolver_match=mock.Mock(url_name='product-list'))
+
+    def add_samples(self, count, duration):
+        now = time.monotonic()
+        for _ in range(count):
+            self.middleware.add_sample(now - duration, now)
+
+    def test_single_slow_query(self):
+        self.add_samples(1, 5)
+        self.assertIsNone(self.middleware.get_latency(settings.LOAD_SHEDDING))
+        self.add_samples(19, 0.01)
+        self.assertFalse(self.middleware.is_overloaded(settings.LOAD_SHEDDING))
+
+    def test_slow_queries(self):
+        self.add_samples(17, 0.01)
+        self.add_samples(3, 5)
+        self.assertEqual(self.middleware.get_latency(settings.LOAD_SHEDDING), 5)
+        self.assertTrue(self.middleware.is_overloaded(settings.LOAD_SHEDDING))
+
+    def test_old_queries_expire(self):
+        now = time.monotonic()
+        for _ in range(20):
+            self.middleware.add_sample(now - 20, now - 15)
+        self.assertIsNone(self.middleware.get_latency(settings.LOAD_SHEDDING))
+
+    def test_cancelled_query_not_measured(self):
+        with self.assertRaises(OperationalError):
+            self.middleware.record_query(self.request, cancelled_query, 'SELECT 1', None, False, {})
+        self.assertFalse(self.middleware.samples)
+        self.middleware.record_query(self.request, lambda *args: None, 'SELECT 1', None, False, {})
+        self.assertEqual(len(self.middleware.samples), 1)
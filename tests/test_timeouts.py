@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core import metrics
+from core.exceptions import QUERY_CANCELED
+from core.views import get_statement_timeout
+from management.models import Company
+from users.models import CustomUser
+
+
+class QueryCanceled(Exception):
+    pgcode = QUERY_CANCELED
+
+
+def cancelled_query(*args, **kwargs):
+    raise OperationalError('canceling statement due to statement timeout') from QueryCanceled()
+
+
+class StatementTimeoutApiTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_route_timeout(self):
+        self.assertEqual(get_statement_timeout('product-list'), 2000)
+        self.assertEqual(get_statement_timeout('product'), 5000)
+
+    @mock.patch('management.views.Company.objects.all', cancelled_query)
+    def test_query_timeout(self):
+        response = self.client.get(reverse('company-list'))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data['detail'].code, 'query_timeout')
+
+        admin = CustomUser.objects.create_superuser('admin@example.com', 'admin-password')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['query_timeouts'], {'company-list': 1})
+
+    def test_counters(self):
+        metrics.increment('query_timeouts', 'company-list')
+        metrics.increment('query_timeouts', 'product-list')
+        metrics.increment('query_timeouts', 'company-list')
+        self.assertEqual(metrics.get_counters('query_timeouts'), {'company-list': 2, 'product-list': 1})
+
+
+def slow_companies():
+    return Company.objects.extra(where=['(SELECT true FROM pg_sleep(0.2))'])
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "statement_timeout requires PostgreSQL")
+class PostgresStatementTimeoutApiTest(APITestCase):
+    @override_settings(STATEMENT_TIMEOUTS={'DEFAULT': 5000, 'ROUTES': {'company-list': 50}})
+    @mock.patch('management.views.Company.objects.all', slow_companies)
+    def test_statement_timeout(self):
+        response = self.client.get(reverse('company-list'))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data['detail'].code, 'query_timeout')
+
+        # SET LOCAL ends with the request's transaction
+        with connection.cursor() as cursor:
+            cursor.execute('SHOW statement_timeout')
+            self.assertEqual(cursor.fetchone()[0], '0')
@@ -1,4 +1,7 @@
 from django.contrib import admin
 from users.models import CustomUser
 
-admin.site.register(CustomUser)
\ No newline at end of file
+
+@admin.register(CustomUser)
+class CustomUserAdmin(admin.ModelAdmin):
+    search_fields = ('email',)
@@ -0,0 +1,106 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from core.caches import is_shared_cache
+
+
+class LocalTokenCache:
+    """
+    Bounded per-process LRU of resolved tokens with a short expiry,
+    so a revoked token stops working in every worker within the ttl.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            token, expires = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return token
+
+    def set(self, key, token):
+        with self._lock:
+            self._data[key] = (token, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_tokens = LocalTokenCache(
+    maxsize=getattr(settings, 'AUTH_TOKEN_LOCAL_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'AUTH_TOKEN_LOCAL_CACHE_TTL', 5),
+)
+
+
+def get_token_cache_key(key):
+    return 'auth-token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(key):
+    cache_key = get_token_cache_key(key)
+    local_tokens.delete(cache_key)
+    cache.delete(cache_key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that resolves the token owner from the in-process
+    cache first, then the shared cache and only then from the database.
+
+    The shared cache is skipped when the default cache is local to the
+    process, its ttl would otherwise delay revocation in other workers.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = get_token_cache_key(key)
+        token = local_tokens.get(cache_key)
+        if token is None:
+            shared = is_shared_cache()
+            token = cache.get(cache_key) if shared else None
+            if token is None:
+                model = self.get_model()
+                try:
+                    token = model.objects.select_related('user').get(key=key)
+                except model.DoesNotExist:
+                    raise exceptions.AuthenticationFailed(_('Invalid token.'))
+                if shared:
+                    cache.set(cache_key, token, getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 300))
+            local_tokens.set(cache_key, token)
+
+        # Every request gets its own instances, so changes to request.user
+        # do not leak into the cache and other requests
+        user = copy.copy(token.user)
+        token = copy.copy(token)
+        token.user = user
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (token.user, token)
@@ -0,0 +1,43 @@
+import base64
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from users.authentication import CachedTokenAuthentication
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Measure per-request authentication overhead of basic and cached token auth"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        factory = APIRequestFactory()
+
+        with transaction.atomic():
+            user = CustomUser.objects.create_user('bench-auth@example.com', 'bench-password')
+            token = Token.objects.create(user=user)
+
+            credentials = base64.b64encode(b'bench-auth@example.com:bench-password').decode()
+            basic = factory.get('/', HTTP_AUTHORIZATION=f'Basic {credentials}')
+            cached = factory.get('/', HTTP_AUTHORIZATION=f'Token {token.key}')
+
+            self.report('BasicAuthentication', BasicAuthentication(), basic, iterations)
+            self.report('CachedTokenAuthentication', CachedTokenAuthentication(), cached, iterations)
+
+            transaction.set_rollback(True)
+
+    def report(self, name, authenticator, request, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            authenticator.authenticate(Request(request))
+        elapsed = (time.perf_counter() - start) / iterations * 1000
+        self.stdout.write(f"{name}: {elapsed:.3f} ms/request")
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from users.authentication import invalidate_token
+from users.models import CustomUser
+
+
+@receiver(post_delete, sender=Token)
+def revoke_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=CustomUser)
+def revoke_user_tokens(sender, instance, **kwargs):
+    for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+        invalidate_token(key)